@@ -2,7 +2,7 @@
 """Check the progress of data loading."""
 
 import os
-import pickle
+import json
 import psycopg2
 from pathlib import Path
 
@@ -12,7 +12,7 @@ load_dotenv()
 DATABASE_URL = os.getenv('DATABASE_URL') or os.getenv('POSTGRES_URI')
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL or POSTGRES_URI environment variable is not set.")
-CHECKPOINT_FILE = Path(__file__).parent.parent / "data" / "pwc-archive" / ".load_checkpoint.pkl"
+CHECKPOINT_FILE = Path(__file__).parent.parent / "data" / "pwc-archive" / ".load_checkpoint.json"
 
 # Total expected counts
 TOTAL_PAPERS = 576261
@@ -27,8 +27,8 @@ def main():
 
     # Check checkpoint
     if CHECKPOINT_FILE.exists():
-        with open(CHECKPOINT_FILE, 'rb') as f:
-            checkpoint = pickle.load(f)
+        with open(CHECKPOINT_FILE) as f:
+            checkpoint = json.load(f)
 
         papers_offset = checkpoint.get('papers_offset', 0)
         datasets_offset = checkpoint.get('datasets_offset', 0)
@@ -56,31 +56,39 @@ def main():
 
         print("\nDatabase Row Counts:")
 
-        cur.execute("SELECT COUNT(*) FROM papers;")
-        papers_count = cur.fetchone()[0]
-        print(f"  Papers: {papers_count:,}")
+        # Fetch every count and the latest paper in a single round-trip
+        cur.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM papers),
+                (SELECT COUNT(*) FROM datasets),
+                (SELECT COUNT(*) FROM implementations),
+                (SELECT COUNT(*) FROM benchmarks),
+                (SELECT COUNT(*) FROM benchmark_results),
+                latest.title,
+                latest.published_date
+            FROM (SELECT 1) AS one
+            LEFT JOIN (
+                SELECT title, published_date FROM papers ORDER BY created_at DESC LIMIT 1
+            ) AS latest ON TRUE;
+        """)
+        (
+            papers_count,
+            datasets_count,
+            impl_count,
+            bench_count,
+            results_count,
+            latest_title,
+            latest_date,
+        ) = cur.fetchone()
 
-        cur.execute("SELECT COUNT(*) FROM datasets;")
-        datasets_count = cur.fetchone()[0]
+        print(f"  Papers: {papers_count:,}")
         print(f"  Datasets: {datasets_count:,}")
-
-        cur.execute("SELECT COUNT(*) FROM implementations;")
-        impl_count = cur.fetchone()[0]
         print(f"  Implementations: {impl_count:,}")
-
-        cur.execute("SELECT COUNT(*) FROM benchmarks;")
-        bench_count = cur.fetchone()[0]
         print(f"  Benchmarks: {bench_count:,}")
-
-        cur.execute("SELECT COUNT(*) FROM benchmark_results;")
-        results_count = cur.fetchone()[0]
         print(f"  Benchmark Results: {results_count:,}")
 
-        # Get latest paper
-        cur.execute("SELECT title, published_date FROM papers ORDER BY created_at DESC LIMIT 1;")
-        latest = cur.fetchone()
-        if latest:
-            print(f"\nLatest Paper: {latest[0][:60]}... ({latest[1]})")
+        if latest_title:
+            print(f"\nLatest Paper: {latest_title[:60]}... ({latest_date})")
 
         cur.close()
         conn.close()
@@ -7,14 +7,26 @@ This script downloads the PWC archive datasets and saves them in various formats
 """
 
 import argparse
+import json
+import os
+import re
 import sys
+import tempfile
+from collections import defaultdict
 from pathlib import Path
 
+# Use hf_xet's multi-connection high-performance mode for Hub downloads.
+# Must be set before huggingface_hub is imported.
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
 try:
-    from datasets import load_dataset
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    from huggingface_hub import HfApi, snapshot_download
 except ImportError:
     print("Error: Required packages not installed.")
-    print("Please install them with: pip install datasets huggingface_hub")
+    print("Please install them with: pip install huggingface_hub pyarrow")
     sys.exit(1)
 
 
@@ -52,12 +64,124 @@ PWC_DATASETS = {
     },
 }
 
+# Split names recognised in data file paths, following the Hub's conventions
+SPLIT_KEYWORDS = {
+    "train": ["train", "training"],
+    "validation": ["validation", "valid", "dev", "val"],
+    "test": ["test", "testing", "eval", "evaluation"],
+}
+SHARDED_SPLIT_FILE = re.compile(r"^data/(?P<split>\w+)-\d{5}-of-\d{5}[^/]*$")
+SPLIT_DELIMITER = "[-._ 0-9]"
+
+
+def group_by_split(files: list[str]) -> dict[str, list[str]]:
+    """
+    Group a dataset repo's data files by split, the way load_dataset does.
+
+    The Hub's sharded "data/{split}-00000-of-00001" names are tried first,
+    then directories named after a split, then split keywords in file names.
+    If none of these apply, every file belongs to "train". Raises ValueError
+    if the naming scheme in use leaves some files without a split.
+    """
+    sharded = [SHARDED_SPLIT_FILE.match(f) for f in files]
+    if files and all(sharded):
+        splits = defaultdict(list)
+        for match in sharded:
+            splits[match["split"]].append(match.string)
+        return dict(splits)
+
+    in_dir_name = {
+        split: re.compile(rf"(^|/)({'|'.join(keywords)})({SPLIT_DELIMITER}[^/]*)?/", re.IGNORECASE)
+        for split, keywords in SPLIT_KEYWORDS.items()
+    }
+    in_file_name = {
+        split: re.compile(
+            rf"(^|/|{SPLIT_DELIMITER})({'|'.join(keywords)}){SPLIT_DELIMITER}[^/]*$", re.IGNORECASE
+        )
+        for split, keywords in SPLIT_KEYWORDS.items()
+    }
+    for patterns in (in_dir_name, in_file_name):
+        splits = defaultdict(list)
+        unmatched = []
+        for f in files:
+            split = next((split for split, pattern in patterns.items() if pattern.search(f)), None)
+            if split is None:
+                unmatched.append(f)
+            else:
+                splits[split].append(f)
+        if splits and unmatched:
+            raise ValueError(f"Can't tell which split these files belong to: {unmatched}")
+        if splits:
+            return dict(splits)
+    return {"train": list(files)} if files else {}
+
+
+def merge_parquet(shards: list[Path], output_file: Path) -> None:
+    """
+    Combine downloaded parquet shards into a single zstd-compressed file.
+
+    Shards are streamed into the output a row group at a time. The Hub files
+    are usually snappy-compressed; zstd is noticeably smaller and decodes at
+    least as fast, which the database loader benefits from.
+    """
+    schema = pq.read_schema(shards[0])
+    with pq.ParquetWriter(
+        output_file,
+        schema,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        data_page_size=1 << 20,
+        write_statistics=True,
+    ) as writer:
+        for shard in shards:
+            shard_file = pq.ParquetFile(shard)
+            for i in range(shard_file.num_row_groups):
+                writer.write_table(shard_file.read_row_group(i))
+
+
+def write_json_lines(parquet_file: Path, output_file: Path) -> None:
+    """Write a parquet file as JSON lines, one record batch at a time."""
+    with open(output_file, "w") as f:
+        for batch in pq.ParquetFile(parquet_file).iter_batches():
+            for record in batch.to_pylist():
+                f.write(json.dumps(record, default=str))
+                f.write("\n")
+
+
+def flatten_for_csv(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Encode nested (list/struct) columns as JSON text, which CSV can't hold natively."""
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_nested(column.type):
+            column = pa.array(
+                [None if v is None else json.dumps(v, default=str) for v in column.to_pylist()],
+                pa.string(),
+            )
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def write_csv(parquet_file: Path, output_file: Path) -> None:
+    """Write a parquet file as CSV, one record batch at a time."""
+    writer = None
+    try:
+        for batch in pq.ParquetFile(parquet_file).iter_batches():
+            batch = flatten_for_csv(batch)
+            if writer is None:
+                writer = pa_csv.CSVWriter(output_file, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
 
 def download_dataset(
     dataset_id: str,
     output_dir: Path,
     formats: list[str] | None = None,
     split: str | None = None,
+    max_workers: int = 8,
 ) -> bool:
     """
     Download a dataset from Hugging Face and save in specified formats.
@@ -67,6 +191,7 @@ def download_dataset(
         output_dir: Directory to save the downloaded data
         formats: List of formats to save ('parquet', 'json', 'csv')
         split: Specific split to download (e.g., 'train'), or None for all splits
+        max_workers: Number of data files downloaded concurrently
 
     Returns:
         True if successful, False otherwise
@@ -84,35 +209,54 @@ def download_dataset(
         dataset_dir = output_dir / dataset_name
         dataset_dir.mkdir(parents=True, exist_ok=True)
 
-        # Load dataset
-        print("Loading dataset from Hugging Face...")
-        dataset = load_dataset(dataset_id, split=split)
-
-        # Handle dataset dict vs single dataset
-        if hasattr(dataset, "keys"):
-            # Multiple splits
-            print(f"Found splits: {list(dataset.keys())}")
-            datasets_to_save = dataset
-        else:
-            # Single split
-            datasets_to_save = {"train": dataset}
-
-        # Save in requested formats
-        for split_name, split_data in datasets_to_save.items():
-            print(f"\nProcessing split '{split_name}' ({len(split_data)} rows)...")
-
-            for format_type in formats:
-                output_file = dataset_dir / f"{split_name}.{format_type}"
-                print(f"  Saving as {format_type}: {output_file.name}")
-
-                if format_type == "parquet":
-                    split_data.to_parquet(str(output_file))
-                elif format_type == "json":
-                    split_data.to_json(str(output_file), orient="records", lines=True)
-                elif format_type == "csv":
-                    split_data.to_csv(str(output_file), index=False)
-                else:
-                    print(f"  Warning: Unknown format '{format_type}', skipping")
+        # Fetch the source parquet files directly rather than going through
+        # load_dataset, which would also convert them into an Arrow cache
+        repo_files = HfApi().list_repo_files(dataset_id, repo_type="dataset")
+        splits = group_by_split(sorted(f for f in repo_files if f.endswith(".parquet")))
+        if split:
+            if split not in splits:
+                raise FileNotFoundError(
+                    f"No parquet files found for split '{split}' (available: {list(splits)})"
+                )
+            splits = {split: splits[split]}
+        if not splits:
+            raise FileNotFoundError(f"No parquet files found in {dataset_id}")
+        print(f"Found splits: {list(splits.keys())}")
+
+        # Shards go to the Hugging Face cache (HF_HUB_CACHE), so reruns reuse them
+        print("Downloading parquet files from Hugging Face...")
+        snapshot_dir = Path(
+            snapshot_download(
+                repo_id=dataset_id,
+                repo_type="dataset",
+                allow_patterns=[f for split_files in splits.values() for f in split_files],
+                max_workers=max_workers,
+            )
+        )
+
+        with tempfile.TemporaryDirectory(dir=dataset_dir) as scratch_dir:
+            for split_name, split_files in splits.items():
+                # Merged in the scratch directory, so earlier downloads in
+                # dataset_dir are only replaced when parquet is requested
+                parquet_file = Path(scratch_dir) / f"{split_name}.parquet"
+                merge_parquet([snapshot_dir / f for f in split_files], parquet_file)
+                num_rows = pq.ParquetFile(parquet_file).metadata.num_rows
+                print(f"\nProcessing split '{split_name}' ({num_rows} rows)...")
+
+                # Save in requested formats
+                for format_type in formats:
+                    output_file = dataset_dir / f"{split_name}.{format_type}"
+                    print(f"  Saving as {format_type}: {output_file.name}")
+
+                    if format_type == "parquet":
+                        parquet_file.replace(output_file)
+                        parquet_file = output_file
+                    elif format_type == "json":
+                        write_json_lines(parquet_file, output_file)
+                    elif format_type == "csv":
+                        write_csv(parquet_file, output_file)
+                    else:
+                        print(f"  Warning: Unknown format '{format_type}', skipping")
 
         print(f"\n✓ Successfully downloaded {dataset_id}")
         print(f"  Saved to: {dataset_dir}")
@@ -182,6 +326,13 @@ Examples:
         help="Specific split to download (e.g., 'train'), or None for all splits",
     )
 
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Number of data files downloaded concurrently (default: 8)",
+    )
+
     parser.add_argument(
         "--list",
         action="store_true",
@@ -230,6 +381,7 @@ Examples:
             output_dir=output_dir,
             formats=args.formats,
             split=args.split,
+            max_workers=args.max_workers,
         )
         results[dataset_name] = success
 
@@ -2,14 +2,23 @@
 """Load Papers with Code data from parquet files into Postgres database with checkpoint support."""
 
 import os
+import io
 import json
+import math
 import psycopg2
 import psycopg2.extras
+from psycopg2.pool import ThreadedConnectionPool
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from tqdm import tqdm
 from pathlib import Path
-from datetime import datetime
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import queue
+import threading
 from typing import Optional
-import pickle
 import argparse
 from dotenv import load_dotenv
 
@@ -24,15 +33,20 @@ if not DATABASE_URL:
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent / "data" / "pwc-archive"
-CHECKPOINT_FILE = DATA_DIR / ".load_checkpoint.pkl"
+CHECKPOINT_FILE = DATA_DIR / ".load_checkpoint.json"
+
+# Loaders run concurrently, so checkpoint writes are serialised and an
+# interrupt in one thread tells the others to stop after their current batch
+CHECKPOINT_LOCK = threading.Lock()
+STOP_LOADING = threading.Event()
+
+# Tables written by the loaders
+LOADED_TABLES = ["papers", "datasets", "implementations", "benchmarks", "benchmark_results"]
 
 
 def load_checkpoint():
     """Load checkpoint data if it exists."""
-    if CHECKPOINT_FILE.exists():
-        with open(CHECKPOINT_FILE, "rb") as f:
-            return pickle.load(f)
-    return {
+    checkpoint = {
         "papers_offset": 0,
         "datasets_offset": 0,
         "links_offset": 0,
@@ -41,13 +55,26 @@ def load_checkpoint():
         "datasets_complete": False,
         "links_complete": False,
         "eval_complete": False,
+        # (name, definition) of indexes a --bulk run dropped and hasn't rebuilt
+        "dropped_indexes": [],
     }
+    if CHECKPOINT_FILE.exists():
+        with open(CHECKPOINT_FILE) as f:
+            checkpoint.update(json.load(f))
+    return checkpoint
 
 
 def save_checkpoint(checkpoint):
-    """Save checkpoint data."""
-    with open(CHECKPOINT_FILE, "wb") as f:
-        pickle.dump(checkpoint, f)
+    """Save checkpoint data.
+
+    Writes to a temporary file and renames it into place, so a crash
+    mid-write never leaves a truncated checkpoint to resume from.
+    """
+    with CHECKPOINT_LOCK:
+        tmp = CHECKPOINT_FILE.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, CHECKPOINT_FILE)
 
 
 def clear_checkpoint():
@@ -56,9 +83,249 @@ def clear_checkpoint():
         CHECKPOINT_FILE.unlink()
 
 
+def configure_session(conn):
+    """Tune a database connection for bulk loading.
+
+    Commits don't wait for the WAL flush. A database server crash can lose
+    the last fraction of a second of batches; every insert skips conflicts,
+    so re-running with --fresh restores them.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SET synchronous_commit = off;")
+    conn.commit()
+
+
 def connect_db():
-    """Create database connection."""
-    return psycopg2.connect(DATABASE_URL)
+    """Create database connection for bulk loading."""
+    conn = psycopg2.connect(DATABASE_URL)
+    configure_session(conn)
+    return conn
+
+
+def run_loaders_concurrently(loaders, checkpoint, pool):
+    """Run independent loaders in parallel, each on its own pooled connection.
+
+    Returns the loaders' results in order. If any loader fails (or the user
+    interrupts), the others stop after their current batch.
+    """
+
+    def run(loader):
+        conn = pool.getconn()
+        try:
+            configure_session(conn)
+            return loader(conn, checkpoint=checkpoint)
+        finally:
+            pool.putconn(conn)
+
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = [executor.submit(run, loader) for loader in loaders]
+        try:
+            # Surface the first failure as soon as it happens
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+            return [future.result() for future in futures]
+        except BaseException:
+            STOP_LOADING.set()
+            raise
+
+
+def parse_authors(authors):
+    """Normalise a parquet authors cell to a JSON string (or None)."""
+    if authors is not None and hasattr(authors, "tolist"):
+        # Convert numpy array to list
+        authors = authors.tolist()
+    elif isinstance(authors, str):
+        try:
+            authors = json.loads(authors)
+        except:
+            authors = None
+    elif not isinstance(authors, list):
+        authors = None
+
+    return json.dumps(authors) if authors else None
+
+
+def encode_authors(authors):
+    """Encode a column of parquet authors cells as JSON strings (or None)."""
+    # Parquet list columns decode to numpy arrays; only other cell types need
+    # the slower normalisation in parse_authors
+    return [
+        json.dumps(a.tolist()) if isinstance(a, np.ndarray) and a.size else parse_authors(a)
+        for a in authors
+    ]
+
+
+def parse_dates(published_dates):
+    """Normalise a column of parquet date cells to ISO date strings (None if invalid)."""
+    try:
+        dates = pa.array(published_dates, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        dates = None  # Mixed cell types
+
+    if dates is not None and pa.types.is_string(dates.type):
+        dates = pc.strptime(dates, format="%Y-%m-%d", unit="s", error_is_null=True)
+    if dates is None or not (
+        pa.types.is_timestamp(dates.type)
+        or pa.types.is_date(dates.type)
+        or pa.types.is_null(dates.type)
+    ):
+        # Unexpected cell types take the slower pandas route
+        dates = pd.to_datetime(published_dates, format="%Y-%m-%d", errors="coerce")
+        return dates.dt.strftime("%Y-%m-%d")
+    return pc.cast(dates, pa.date32(), safe=False).cast(pa.string()).to_pandas()
+
+
+def parse_modalities(modalities):
+    """Normalise a parquet modalities cell to a list (or None)."""
+    if modalities is not None and hasattr(modalities, "tolist"):
+        return modalities.tolist()
+    if isinstance(modalities, str):
+        return [m.strip() for m in modalities.split(",")]
+    if isinstance(modalities, list):
+        return modalities
+    return None
+
+
+def column(df, name):
+    """Return a column from the frame, or an all-None column if it is missing."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def iter_parquet_batches(parquet, batch_size, start_offset=0, columns=None):
+    """Stream (offset, DataFrame) batches from a ParquetFile, resuming at start_offset.
+
+    Row groups that end before start_offset are skipped without being read, so
+    only one batch is held in memory at a time. When columns is given, only
+    those columns (of the ones present in the file) are decoded.
+    """
+    if columns is not None:
+        available = set(parquet.schema_arrow.names)
+        columns = [name for name in columns if name in available]
+
+    row_groups = []
+    offset = 0
+    for index in range(parquet.metadata.num_row_groups):
+        num_rows = parquet.metadata.row_group(index).num_rows
+        if offset + num_rows > start_offset or row_groups:
+            row_groups.append(index)
+        else:
+            offset += num_rows
+
+    if not row_groups:
+        return
+
+    for record_batch in parquet.iter_batches(
+        batch_size=batch_size, row_groups=row_groups, columns=columns
+    ):
+        # Stop between batches once another loader has failed or been interrupted
+        if STOP_LOADING.is_set():
+            raise KeyboardInterrupt
+        end = offset + record_batch.num_rows
+        if end > start_offset:
+            if offset < start_offset:
+                record_batch = record_batch.slice(start_offset - offset)
+                offset = start_offset
+            yield offset, record_batch.to_pandas()
+        offset = end
+
+
+def prefetch(iterable, maxsize=4):
+    """Run an iterator on a background thread, buffering up to maxsize items.
+
+    Used to decode the next parquet batches while the current one is being
+    written to the database. Exceptions from the producer are re-raised in
+    the consumer.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for value in iterable:
+                if not put(("item", value)):
+                    return
+            put(("done", None))
+        except BaseException as e:
+            put(("error", e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stopped.set()
+
+
+def fetch_paper_ids(cur):
+    """Map every loaded arxiv_id to its paper id in a single query."""
+    cur.execute("SELECT arxiv_id, id FROM papers WHERE arxiv_id IS NOT NULL;")
+    return dict(cur.fetchall())
+
+
+def copy_value(value):
+    """Format a Python value as a field in Postgres COPY text format."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        # Array literal, e.g. {"Images","Text"}
+        items = []
+        for v in value:
+            if v is None:
+                items.append("NULL")
+            else:
+                escaped = str(v).replace("\\", "\\\\").replace('"', '\\"')
+                items.append(f'"{escaped}"')
+        value = "{" + ",".join(items) + "}"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_insert(cur, table, columns, rows, conflict):
+    """Bulk load rows into a table via COPY into a staging table.
+
+    Rows are streamed into a temporary staging table with COPY, then moved
+    into the target with a single INSERT ... SELECT so the ON CONFLICT clause
+    still applies. Returns the number of rows actually inserted.
+    """
+    stage = f"{table}_stage"
+    column_list = ", ".join(columns)
+
+    cur.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {stage} AS SELECT {column_list} FROM {table} WITH NO DATA;"
+    )
+    cur.execute(f"TRUNCATE {stage};")
+
+    buf = io.StringIO("".join("\t".join(map(copy_value, row)) + "\n" for row in rows))
+    cur.copy_expert(f"COPY {stage} ({column_list}) FROM STDIN", buf)
+
+    cur.execute(
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage} {conflict};"
+    )
+    return cur.rowcount
 
 
 def load_papers(conn, batch_size=1000, checkpoint=None):
@@ -75,95 +342,90 @@ def load_papers(conn, batch_size=1000, checkpoint=None):
         return 0
 
     print(f"\nLoading papers from {papers_file}...")
-    df = pd.read_parquet(papers_file)
+    parquet = pq.ParquetFile(papers_file)
+    total = parquet.metadata.num_rows
 
     start_offset = checkpoint.get("papers_offset", 0) if checkpoint else 0
-    print(f"Total papers: {len(df)}, starting from offset: {start_offset}")
+    print(f"Total papers: {total}, starting from offset: {start_offset}")
 
     cur = conn.cursor()
     inserted = 0
     skipped = 0
+    seen_arxiv_ids = set()
+
+    # Process in batches, only decoding the columns that are actually loaded
+    columns = [
+        "title",
+        "abstract",
+        "arxiv_id",
+        "url_abs",
+        "url_pdf",
+        "date",
+        "authors",
+    ]
+    # Decode upcoming batches in the background while this one is written
+    batches = iter_parquet_batches(parquet, batch_size, start_offset, columns)
+    with tqdm(total=total, initial=start_offset, desc="papers", unit="rows") as progress:
+        for offset, batch in prefetch(batches):
+            end = offset + len(batch)
+
+            # Skip papers without arxiv_id for now (they can't be linked properly)
+            has_arxiv_id = batch["arxiv_id"].notna()
+            skipped += int((~has_arxiv_id).sum())
+            batch = batch[has_arxiv_id]
+
+            # Drop arxiv ids already sent in this run rather than making
+            # Postgres resolve the conflict
+            duplicate = batch["arxiv_id"].duplicated() | batch["arxiv_id"].isin(seen_arxiv_ids)
+            skipped += int(duplicate.sum())
+            batch = batch[~duplicate]
+
+            rows = list(
+                zip(
+                    batch["title"],
+                    batch["abstract"],
+                    batch["arxiv_id"],
+                    batch["url_abs"],
+                    batch["url_pdf"],
+                    parse_dates(batch["date"]),
+                    encode_authors(batch["authors"]),
+                    strict=True,
+                )
+            )
 
-    # Process in batches
-    for i in range(start_offset, len(df), batch_size):
-        batch = df.iloc[i : i + batch_size]
-
-        for _, row in batch.iterrows():
             try:
-                # Skip papers without arxiv_id for now (they can't be linked properly)
-                arxiv_id = row.get("arxiv_id")
-                if pd.isna(arxiv_id):
-                    skipped += 1
-                    continue
-
-                # Parse authors (it's a numpy array in parquet files)
-                authors = row.get("authors")
-                if authors is not None and hasattr(authors, "tolist"):
-                    # Convert numpy array to list
-                    authors = authors.tolist()
-                elif isinstance(authors, str):
-                    try:
-                        authors = json.loads(authors)
-                    except:
-                        authors = None
-                elif isinstance(authors, list):
-                    authors = authors
-                else:
-                    authors = None
-
-                # Parse published date
-                published_date = row.get("date")
-                if pd.notna(published_date):
-                    # Convert to string format if it's a timestamp
-                    if isinstance(published_date, pd.Timestamp):
-                        published_date = published_date.date()
-                    elif isinstance(published_date, str):
-                        # Try to parse the date string
-                        try:
-                            published_date = datetime.strptime(published_date, "%Y-%m-%d").date()
-                        except:
-                            published_date = None
-                else:
-                    published_date = None
-
-                cur.execute(
-                    """
-                    INSERT INTO papers (title, abstract, arxiv_id, arxiv_url, pdf_url, published_date, authors)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (arxiv_id) DO NOTHING
-                    RETURNING id;
-                """,
-                    (
-                        row.get("title"),
-                        row.get("abstract"),
-                        arxiv_id,
-                        row.get("url_abs"),
-                        row.get("url_pdf"),
-                        published_date,
-                        json.dumps(authors) if authors else None,
-                    ),
+                # COPY the batch in one stream instead of a round-trip per paper
+                batch_inserted = copy_insert(
+                    cur,
+                    "papers",
+                    [
+                        "title",
+                        "abstract",
+                        "arxiv_id",
+                        "arxiv_url",
+                        "pdf_url",
+                        "published_date",
+                        "authors",
+                    ],
+                    rows,
+                    "ON CONFLICT (arxiv_id) DO NOTHING",
                 )
-
-                if cur.fetchone():
-                    inserted += 1
-                else:
-                    skipped += 1
+                inserted += batch_inserted
+                skipped += len(rows) - batch_inserted
+                conn.commit()
+                seen_arxiv_ids.update(batch["arxiv_id"])
 
             except Exception as e:
-                print(f"Error inserting paper: {e}")
+                tqdm.write(f"Error inserting papers batch: {e}")
                 conn.rollback()  # Reset transaction state
-                continue
-
-        conn.commit()
 
-        # Save checkpoint after each batch
-        if checkpoint is not None:
-            checkpoint["papers_offset"] = i + batch_size
-            save_checkpoint(checkpoint)
+            # Save checkpoint after each batch
+            if checkpoint is not None:
+                checkpoint["papers_offset"] = end
+                save_checkpoint(checkpoint)
 
-        print(
-            f"  Processed {min(i + batch_size, len(df))}/{len(df)} papers ({inserted} inserted, {skipped} skipped)"
-        )
+            progress.update(end - progress.n)
+            progress.set_postfix(inserted=inserted, skipped=skipped, refresh=False)
 
     if checkpoint is not None:
         checkpoint["papers_complete"] = True
@@ -190,69 +452,68 @@ def load_datasets(conn, batch_size=1000, checkpoint=None):
         return 0
 
     print(f"\nLoading datasets from {datasets_file}...")
-    df = pd.read_parquet(datasets_file)
+    parquet = pq.ParquetFile(datasets_file)
+    total = parquet.metadata.num_rows
 
     start_offset = checkpoint.get("datasets_offset", 0) if checkpoint else 0
-    print(f"Total datasets: {len(df)}, starting from offset: {start_offset}")
+    print(f"Total datasets: {total}, starting from offset: {start_offset}")
 
     cur = conn.cursor()
     inserted = 0
     skipped = 0
+    seen_names = set()
+
+    # Only decode the columns that are actually loaded
+    columns = ["name", "description", "modalities", "homepage", "paper"]
+    with tqdm(total=total, initial=start_offset, desc="datasets", unit="rows") as progress:
+        for offset, batch in iter_parquet_batches(parquet, batch_size, start_offset, columns):
+            end = offset + len(batch)
+
+            # Drop names already sent in this run rather than making Postgres
+            # resolve the conflict
+            names = batch["name"]
+            duplicate = names.notna() & (names.duplicated() | names.isin(seen_names))
+            skipped += int(duplicate.sum())
+            batch = batch[~duplicate]
+
+            # Extract paper URL if it's a dict
+            paper_urls = [p.get("url") if isinstance(p, dict) else None for p in batch["paper"]]
+
+            rows = list(
+                zip(
+                    batch["name"],
+                    batch["description"],
+                    [parse_modalities(m) for m in batch["modalities"]],
+                    batch["homepage"],
+                    paper_urls,
+                    strict=True,
+                )
+            )
 
-    for i in range(start_offset, len(df), batch_size):
-        batch = df.iloc[i : i + batch_size]
-
-        for _, row in batch.iterrows():
             try:
-                # Parse modalities and other arrays
-                modalities = row.get("modalities")
-                if modalities is not None and hasattr(modalities, "tolist"):
-                    modalities = modalities.tolist()
-                elif isinstance(modalities, str):
-                    modalities = [m.strip() for m in modalities.split(",")]
-                elif not isinstance(modalities, list):
-                    modalities = None
-
-                # Extract paper URL if it's a dict
-                paper_info = row.get("paper")
-                paper_url = paper_info.get("url") if isinstance(paper_info, dict) else None
-
-                cur.execute(
-                    """
-                    INSERT INTO datasets (name, description, modalities, homepage_url, paper_url)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (name) DO NOTHING
-                    RETURNING id;
-                """,
-                    (
-                        row.get("name"),
-                        row.get("description"),
-                        modalities,
-                        row.get("homepage"),
-                        paper_url,
-                    ),
+                batch_inserted = copy_insert(
+                    cur,
+                    "datasets",
+                    ["name", "description", "modalities", "homepage_url", "paper_url"],
+                    rows,
+                    "ON CONFLICT (name) DO NOTHING",
                 )
-
-                if cur.fetchone():
-                    inserted += 1
-                else:
-                    skipped += 1
+                inserted += batch_inserted
+                skipped += len(rows) - batch_inserted
+                conn.commit()
+                seen_names.update(batch["name"].dropna())
 
             except Exception as e:
-                print(f"Error inserting dataset: {e}")
+                tqdm.write(f"Error inserting datasets batch: {e}")
                 conn.rollback()
-                continue
 
-        conn.commit()
+            # Save checkpoint after each batch
+            if checkpoint is not None:
+                checkpoint["datasets_offset"] = end
+                save_checkpoint(checkpoint)
 
-        # Save checkpoint after each batch
-        if checkpoint is not None:
-            checkpoint["datasets_offset"] = i + batch_size
-            save_checkpoint(checkpoint)
-
-        print(
-            f"  Processed {min(i + batch_size, len(df))}/{len(df)} datasets ({inserted} inserted, {skipped} skipped)"
-        )
+            progress.update(end - progress.n)
+            progress.set_postfix(inserted=inserted, skipped=skipped, refresh=False)
 
     if checkpoint is not None:
         checkpoint["datasets_complete"] = True
@@ -277,78 +538,73 @@ def load_code_links(conn, batch_size=1000, checkpoint=None):
         return 0
 
     print(f"\nLoading code links from {links_file}...")
-    df = pd.read_parquet(links_file)
+    parquet = pq.ParquetFile(links_file)
+    total = parquet.metadata.num_rows
 
     start_offset = checkpoint.get("links_offset", 0) if checkpoint else 0
-    print(f"Total code links: {len(df)}, starting from offset: {start_offset}")
+    print(f"Total code links: {total}, starting from offset: {start_offset}")
 
     cur = conn.cursor()
     inserted = 0
     skipped = 0
 
-    for i in range(start_offset, len(df), batch_size):
-        batch = df.iloc[i : i + batch_size]
-
-        for _, row in batch.iterrows():
-            try:
-                # Find paper by arxiv_id
-                arxiv_id = row.get("paper_arxiv_id")
-                github_url = row.get("repo_url")
-
-                if not github_url or pd.isna(arxiv_id):
-                    skipped += 1
-                    continue
-
-                # Get paper_id
-                cur.execute(
-                    """
-                    SELECT id FROM papers WHERE arxiv_id = %s LIMIT 1;
-                """,
-                    (arxiv_id,),
-                )
-
-                result = cur.fetchone()
-                if not result:
+    # Resolve papers locally instead of one lookup query per link
+    paper_ids = fetch_paper_ids(cur)
+
+    # Only decode the columns that are actually loaded
+    columns = ["paper_arxiv_id", "repo_url", "framework", "is_official"]
+    # Decode upcoming batches in the background while this one is written
+    batches = iter_parquet_batches(parquet, batch_size, start_offset, columns)
+    with tqdm(total=total, initial=start_offset, desc="code links", unit="rows") as progress:
+        for offset, batch in prefetch(batches):
+            end = offset + len(batch)
+
+            has_link = batch["repo_url"].notna() & (batch["repo_url"] != "")
+            has_link &= batch["paper_arxiv_id"].notna()
+            skipped += int((~has_link).sum())
+            batch = batch[has_link]
+
+            frameworks = [f if pd.notna(f) else None for f in batch["framework"]]
+
+            rows = []
+            for arxiv_id, github_url, framework, is_official in zip(
+                batch["paper_arxiv_id"],
+                batch["repo_url"],
+                frameworks,
+                batch["is_official"],
+                strict=True,
+            ):
+                paper_id = paper_ids.get(arxiv_id)
+                if paper_id is None:
                     skipped += 1
                     continue
 
-                paper_id = result[0]
-
-                # Extract framework and metadata
-                framework = row.get("framework") if pd.notna(row.get("framework")) else None
-                is_official = row.get("is_official", False)
+                rows.append((paper_id, github_url, framework, bool(is_official)))
 
+            try:
                 # Add unique constraint check to avoid duplicates
-                cur.execute(
-                    """
-                    INSERT INTO implementations (paper_id, github_url, framework, is_official)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT DO NOTHING
-                    RETURNING id;
-                """,
-                    (paper_id, github_url, framework, is_official),
+                batch_inserted = copy_insert(
+                    cur,
+                    "implementations",
+                    ["paper_id", "github_url", "framework", "is_official"],
+                    rows,
+                    "ON CONFLICT DO NOTHING",
                 )
-
-                if cur.fetchone():
-                    inserted += 1
-                else:
-                    skipped += 1
+                inserted += batch_inserted
+                skipped += len(rows) - batch_inserted
+                conn.commit()
 
             except Exception as e:
-                print(f"Error inserting implementation: {e}")
+                tqdm.write(f"Error inserting implementations batch: {e}")
                 conn.rollback()
-                continue
-
-        conn.commit()
 
-        # Save checkpoint after each batch
-        if checkpoint is not None:
-            checkpoint["links_offset"] = i + batch_size
-            save_checkpoint(checkpoint)
+            # Save checkpoint after each batch
+            if checkpoint is not None:
+                checkpoint["links_offset"] = end
+                save_checkpoint(checkpoint)
 
-        print(
-            f"  Processed {min(i + batch_size, len(df))}/{len(df)} links ({inserted} inserted, {skipped} skipped)"
-        )
+            progress.update(end - progress.n)
+            progress.set_postfix(inserted=inserted, skipped=skipped, refresh=False)
 
     if checkpoint is not None:
         checkpoint["links_complete"] = True
@@ -373,95 +629,125 @@ def load_evaluation_tables(conn, batch_size=1000, checkpoint=None):
         return 0
 
     print(f"\nLoading evaluation results from {eval_file}...")
-    df = pd.read_parquet(eval_file)
+    parquet = pq.ParquetFile(eval_file)
+    total = parquet.metadata.num_rows
 
     start_offset = checkpoint.get("eval_offset", 0) if checkpoint else 0
-    print(f"Total evaluation records: {len(df)}, starting from offset: {start_offset}")
+    print(f"Total evaluation records: {total}, starting from offset: {start_offset}")
 
     cur = conn.cursor()
     inserted_benchmarks = 0
     inserted_results = 0
     skipped = 0
 
-    for i in range(start_offset, len(df), batch_size):
-        batch = df.iloc[i : i + batch_size]
+    # Resolve papers, datasets and benchmarks locally instead of per-row lookups
+    paper_ids = fetch_paper_ids(cur)
+    cur.execute("SELECT name, id FROM datasets;")
+    dataset_ids = dict(cur.fetchall())
+    benchmark_ids = {}
+
+    # Only decode the columns that are actually loaded
+    columns = ["dataset", "task", "paper_arxiv_id", "metric", "value"]
+    with tqdm(total=total, initial=start_offset, desc="evaluation", unit="rows") as progress:
+        for offset, batch in iter_parquet_batches(parquet, batch_size, start_offset, columns):
+            end = offset + len(batch)
+
+            has_benchmark = column(batch, "dataset").notna() & column(batch, "task").notna()
+            skipped += int((~has_benchmark).sum())
+            batch = batch[has_benchmark]
+            dataset_names = column(batch, "dataset")
+            tasks = column(batch, "task")
+
+            benchmark_names = [
+                f"{dataset_name} - {task}"
+                for dataset_name, task in zip(dataset_names, tasks, strict=True)
+            ]
+            batch_dataset_ids = [dataset_ids.get(dataset_name) for dataset_name in dataset_names]
 
-        for _, row in batch.iterrows():
             try:
-                # Get or create benchmark
-                dataset_name = row.get("dataset")
-                task = row.get("task")
-
-                if pd.isna(dataset_name) or pd.isna(task):
-                    skipped += 1
-                    continue
+                # Upsert every benchmark not seen yet in one statement per batch
+                missing = {}
+                for benchmark_name, dataset_id, task in zip(
+                    benchmark_names, batch_dataset_ids, tasks, strict=True
+                ):
+                    key = (benchmark_name, dataset_id)
+                    if key not in benchmark_ids:
+                        missing.setdefault(key, (benchmark_name, dataset_id, task))
+                if missing:
+                    returned = psycopg2.extras.execute_values(
+                        cur,
+                        """
+                        INSERT INTO benchmarks (name, dataset_id, task)
+                        VALUES %s
+                        ON CONFLICT (name, dataset_id) DO UPDATE SET task = EXCLUDED.task
+                        RETURNING name, dataset_id, id;
+                    """,
+                        list(missing.values()),
+                        page_size=len(missing),
+                        fetch=True,
+                    )
+                    for benchmark_name, dataset_id, benchmark_id in returned:
+                        benchmark_ids[(benchmark_name, dataset_id)] = benchmark_id
+                    inserted_benchmarks += len(returned)
 
-                benchmark_name = f"{dataset_name} - {task}"
-
-                # Find dataset
-                cur.execute("SELECT id FROM datasets WHERE name = %s LIMIT 1;", (dataset_name,))
-                dataset_result = cur.fetchone()
-                dataset_id = dataset_result[0] if dataset_result else None
-
-                # Insert/get benchmark
-                cur.execute(
-                    """
-                    INSERT INTO benchmarks (name, dataset_id, task)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (name, dataset_id) DO UPDATE SET task = EXCLUDED.task
-                    RETURNING id;
-                """,
-                    (benchmark_name, dataset_id, task),
-                )
+            except Exception as e:
+                tqdm.write(f"Error inserting evaluation data: {e}")
+                conn.rollback()
+                benchmark_ids.clear()  # Earlier ids may have been rolled back too
+                continue
 
-                benchmark_id = cur.fetchone()[0]
-                inserted_benchmarks += 1
+            result_rows = []
+            for benchmark_name, dataset_id, paper_arxiv_id, metric_name, metric_value in zip(
+                benchmark_names,
+                batch_dataset_ids,
+                column(batch, "paper_arxiv_id"),
+                column(batch, "metric"),
+                column(batch, "value"),
+                strict=True,
+            ):
+                benchmark_id = benchmark_ids[(benchmark_name, dataset_id)]
 
                 # Get paper if available
-                paper_id = None
-                if "paper_arxiv_id" in row and pd.notna(row.get("paper_arxiv_id")):
-                    cur.execute(
-                        "SELECT id FROM papers WHERE arxiv_id = %s LIMIT 1;",
-                        (row.get("paper_arxiv_id"),),
-                    )
-                    paper_result = cur.fetchone()
-                    paper_id = paper_result[0] if paper_result else None
+                paper_id = paper_ids.get(paper_arxiv_id) if pd.notna(paper_arxiv_id) else None
 
                 # Insert result if we have paper and metric
-                metric_name = row.get("metric")
-                metric_value = row.get("value")
-
                 if paper_id and metric_name and pd.notna(metric_value):
                     try:
                         metric_value = float(metric_value)
-                        cur.execute(
-                            """
-                            INSERT INTO benchmark_results (paper_id, benchmark_id, metric_name, metric_value)
-                            VALUES (%s, %s, %s, %s)
-                            ON CONFLICT (paper_id, benchmark_id, metric_name) DO NOTHING
-                            RETURNING id;
-                        """,
-                            (paper_id, benchmark_id, metric_name, metric_value),
-                        )
-
-                        if cur.fetchone():
-                            inserted_results += 1
+                        result_rows.append((paper_id, benchmark_id, metric_name, metric_value))
                     except (ValueError, TypeError):
                         pass  # Skip non-numeric metrics
 
+            try:
+                if result_rows:
+                    # A single page keeps rowcount covering every inserted row
+                    psycopg2.extras.execute_values(
+                        cur,
+                        """
+                        INSERT INTO benchmark_results (paper_id, benchmark_id, metric_name, metric_value)
+                        VALUES %s
+                        ON CONFLICT (paper_id, benchmark_id, metric_name) DO NOTHING;
+                    """,
+                        result_rows,
+                        page_size=len(result_rows),
+                    )
+                    inserted_results += cur.rowcount
+                conn.commit()
+
             except Exception as e:
-                print(f"Error inserting evaluation data: {e}")
+                tqdm.write(f"Error inserting benchmark results batch: {e}")
                 conn.rollback()
-                continue
+                benchmark_ids.clear()
 
-        conn.commit()
-
-        # Save checkpoint after each batch
-        if checkpoint is not None:
-            checkpoint["eval_offset"] = i + batch_size
-            save_checkpoint(checkpoint)
+            # Save checkpoint after each batch
+            if checkpoint is not None:
+                checkpoint["eval_offset"] = end
+                save_checkpoint(checkpoint)
 
-        print(f"  Processed {min(i + batch_size, len(df))}/{len(df)} records")
+            progress.update(end - progress.n)
+            progress.set_postfix(
+                benchmarks=inserted_benchmarks, results=inserted_results, refresh=False
+            )
 
     if checkpoint is not None:
         checkpoint["eval_complete"] = True
@@ -472,6 +758,78 @@ def load_evaluation_tables(conn, batch_size=1000, checkpoint=None):
     return inserted_results
 
 
+def load_all(checkpoint):
+    """Run every loader, returning the papers, datasets, links and results counts."""
+    # Both stages reuse the same two connections rather than reconnecting
+    pool = ThreadedConnectionPool(0, 2, DATABASE_URL)
+    try:
+        # Load data in order (respecting foreign key constraints). Papers and
+        # datasets are independent of each other, and links and evaluation
+        # results only depend on those, so each pair loads concurrently.
+        papers_count, datasets_count = run_loaders_concurrently(
+            [load_papers, load_datasets], checkpoint, pool
+        )
+        links_count, eval_count = run_loaders_concurrently(
+            [load_code_links, load_evaluation_tables], checkpoint, pool
+        )
+    finally:
+        pool.closeall()
+    return papers_count, datasets_count, links_count, eval_count
+
+
+def restore_dropped_indexes(conn, checkpoint):
+    """Recreate the indexes a bulk load dropped and forget them in the checkpoint.
+
+    Indexes that already exist (e.g. from an interrupted rebuild) are skipped.
+    """
+    with conn.cursor() as cur:
+        for index_name, index_definition in checkpoint["dropped_indexes"]:
+            cur.execute("SELECT to_regclass(%s);", (index_name,))
+            if cur.fetchone()[0] is None:
+                cur.execute(index_definition)
+    conn.commit()
+    checkpoint["dropped_indexes"] = []
+    save_checkpoint(checkpoint)
+
+
+def bulk_load(checkpoint):
+    """Run every loader with secondary indexes dropped, rebuilding them afterwards.
+
+    Building an index once over the loaded rows is much cheaper than
+    maintaining it for every insert. Unique indexes are kept because the
+    ON CONFLICT clauses rely on them.
+    """
+    conn = connect_db()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+            FROM pg_index
+            WHERE indrelid = ANY(%s::regclass[]) AND NOT indisunique;
+        """,
+            (LOADED_TABLES,),
+        )
+        indexes = cur.fetchall()
+        # Recorded before dropping, so a run that gets killed can't lose them
+        checkpoint["dropped_indexes"] = indexes
+        save_checkpoint(checkpoint)
+        for index_name, _ in indexes:
+            cur.execute(f"DROP INDEX {index_name};")
+        conn.commit()
+        print(f"\nDropped {len(indexes)} secondary indexes for the bulk load")
+
+        try:
+            return load_all(checkpoint)
+        finally:
+            # Restore the indexes even if loading failed or was interrupted
+            print(f"\nRebuilding {len(indexes)} indexes...")
+            restore_dropped_indexes(conn, checkpoint)
+            cur.close()
+    finally:
+        conn.close()
+
+
 def main():
     """Main loading function."""
     parser = argparse.ArgumentParser(
@@ -490,6 +848,9 @@ Examples:
 
   # Clear checkpoint and exit
   python load_pwc_data_to_postgres.py --clear-checkpoint
+
+  # Drop secondary indexes while loading and rebuild them at the end
+  python load_pwc_data_to_postgres.py --bulk
         """,
     )
 
@@ -508,12 +869,29 @@ Examples:
         "--clear-checkpoint", action="store_true", help="Clear checkpoint file and exit"
     )
 
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Drop non-unique indexes on the loaded tables during the load and rebuild them after",
+    )
+
     args = parser.parse_args()
 
     print("=" * 60)
     print("Papers with Code Data Loader (with Resume Support)")
     print("=" * 60)
 
+    # A --bulk run that was killed before rebuilding its indexes left them in
+    # the checkpoint; restore them before the checkpoint can be cleared
+    checkpoint = load_checkpoint()
+    if checkpoint["dropped_indexes"]:
+        print(f"\nRebuilding {len(checkpoint['dropped_indexes'])} indexes left by a bulk load...")
+        conn = connect_db()
+        try:
+            restore_dropped_indexes(conn, checkpoint)
+        finally:
+            conn.close()
+
     # Handle clear checkpoint
     if args.clear_checkpoint:
         if CHECKPOINT_FILE.exists():
@@ -575,16 +953,9 @@ Examples:
             print("\n🆕 Starting fresh load (no checkpoint found)")
 
     try:
-        conn = connect_db()
-        print("✓ Connected to database")
-
-        # Load data in order (respecting foreign key constraints)
-        papers_count = load_papers(conn, checkpoint=checkpoint)
-        datasets_count = load_datasets(conn, checkpoint=checkpoint)
-        links_count = load_code_links(conn, checkpoint=checkpoint)
-        eval_count = load_evaluation_tables(conn, checkpoint=checkpoint)
-
-        conn.close()
+        papers_count, datasets_count, links_count, eval_count = (
+            bulk_load(checkpoint) if args.bulk else load_all(checkpoint)
+        )
 
         print("\n" + "=" * 60)
         print("Summary:")
@@ -1,80 +1,251 @@
 #!/usr/bin/env python3
-"""Stream remaining PWC datasets directly to database without local caching."""
+"""Stream remaining PWC datasets directly to database."""
 
 import os
 import json
+import argparse
+from fnmatch import fnmatch
+from multiprocessing import Pool
+from pathlib import Path
 import psycopg2
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from datasets import load_dataset
+from huggingface_hub import snapshot_download
+from psycopg2.extras import execute_values
 
 DATABASE_URL = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URI")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL or POSTGRES_URI must be set")
 
+# Evaluation rows written per transaction
+BATCH_SIZE = 500
+
+# Parquet files of the evaluation-tables train split, and the columns used from them
+EVALUATION_REPO = "pwc-archive/evaluation-tables"
+EVALUATION_FILES = "*train*.parquet"
+EVALUATION_COLUMNS = ["task", "description", "datasets"]
+
+
+def evaluation_files():
+    """Return local paths of the evaluation-tables parquet files.
+
+    The files are downloaded into the Hugging Face cache (HF_HUB_CACHE) on
+    first use. Later runs only check the Hub for a newer revision, and fall
+    back to the cached snapshot when offline (or with HF_HUB_OFFLINE=1).
+    """
+    snapshot = Path(
+        snapshot_download(EVALUATION_REPO, repo_type="dataset", allow_patterns=EVALUATION_FILES)
+    )
+    # The cached snapshot can also hold files fetched for other patterns
+    return sorted(
+        str(path)
+        for path in snapshot.rglob("*.parquet")
+        if fnmatch(path.relative_to(snapshot).as_posix(), EVALUATION_FILES)
+    )
+
+
+def iter_evaluation_batches(paths, rank=0, world_size=1):
+    """Yield record batches of evaluation-table rows from the given parquet files.
+
+    The files are memory-mapped and only the columns that are used are
+    decoded. The rows are split into world_size contiguous ranges and this
+    yields the rank-th one, so workers get even, disjoint shares however the
+    files are laid out in row groups.
+    """
+    parquets = [pq.ParquetFile(path, memory_map=True) for path in paths]
+    total_rows = sum(parquet.metadata.num_rows for parquet in parquets)
+    share = -(-total_rows // world_size)
+    start, end = rank * share, min((rank + 1) * share, total_rows)
+
+    offset = 0
+    for parquet in parquets:
+        columns = [c for c in EVALUATION_COLUMNS if c in parquet.schema_arrow.names]
+        for row_group in range(parquet.num_row_groups):
+            num_rows = parquet.metadata.row_group(row_group).num_rows
+            if offset < end and offset + num_rows > start:
+                table = parquet.read_row_group(row_group, columns=columns)
+                table = table.slice(max(start - offset, 0), end - max(start, offset))
+                yield from table.to_batches(max_chunksize=BATCH_SIZE)
+            offset += num_rows
 
-def stream_evaluation_tables():
-    """Stream evaluation-tables directly to database."""
-    print("\n=== Streaming evaluation-tables ===")
+
+def evaluation_benchmarks(batch):
+    """Flatten evaluation rows into one benchmark per (task, dataset) pair.
+
+    Returns a DataFrame with benchmark_name, dataset_name, task and
+    description (truncated to 500 characters, None if empty) columns. The
+    whole batch is transformed with Arrow kernels rather than row by row.
+    """
+    task = batch.column("task")
+    if "description" in batch.schema.names:
+        description = batch.column("description")
+    else:
+        description = pa.nulls(len(batch), pa.string())
+    description = pc.utf8_slice_codeunits(description, 0, 500)
+    description = pc.if_else(
+        pc.greater(pc.utf8_length(description), 0), description, pa.scalar(None, pa.string())
+    )
+
+    # One entry per listed dataset, pointing back at its evaluation row
+    datasets = batch.column("datasets")
+    parents = pc.list_parent_indices(datasets)
+    dataset_name = pc.list_flatten(datasets).field("dataset")
+    task = task.take(parents)
+    description = description.take(parents)
+
+    # Rows with a missing or empty task or dataset name are dropped
+    keep = pc.and_(
+        pc.greater(pc.utf8_length(task), 0), pc.greater(pc.utf8_length(dataset_name), 0)
+    )
+    return pa.table({
+        "benchmark_name": pc.binary_join_element_wise(task, dataset_name, " on "),
+        "dataset_name": dataset_name,
+        "task": task,
+        "description": description,
+    }).filter(keep).to_pandas()
+
+
+def flush_evaluation_batch(conn, cur, datasets, benchmarks, dataset_ids, known_benchmarks):
+    """Upsert a batch of datasets and insert their benchmarks in one statement.
+
+    datasets maps dataset name -> description, benchmarks holds
+    (benchmark name, dataset name, task, description) tuples. Datasets in
+    dataset_ids (name -> id) and benchmarks in known_benchmarks
+    ((name, dataset id) pairs) already exist and are skipped; both caches are
+    extended once the batch commits.
+    """
+    # One input row per new benchmark. A new dataset is created from the row
+    # of its first mention, whose description it shares, so each description
+    # is sent once.
+    rows = {}
+    created = set()
+    for benchmark_name, dataset_name, task_name, description in benchmarks:
+        dataset_id = dataset_ids.get(dataset_name)
+        key = (benchmark_name, dataset_name)
+        if key in rows or (benchmark_name, dataset_id) in known_benchmarks:
+            continue
+        new_dataset = dataset_id is None and dataset_name not in created
+        if new_dataset:
+            created.add(dataset_name)
+            description = datasets[dataset_name]
+        rows[key] = (
+            benchmark_name, dataset_name, task_name, description, dataset_id, new_dataset
+        )
+    if not rows:
+        return
+
+    # Rows are written in key order so concurrent workers can't deadlock
+    returned = execute_values(cur, """
+        WITH input (benchmark_name, dataset_name, task, description, dataset_id, new_dataset) AS (
+            VALUES %s
+        ), new_datasets AS (
+            INSERT INTO datasets (name, description)
+            SELECT dataset_name, description FROM input WHERE new_dataset
+            ORDER BY dataset_name
+            ON CONFLICT (name) DO UPDATE SET updated_at = NOW()
+            RETURNING name, id
+        ), new_benchmarks AS (
+            INSERT INTO benchmarks (name, dataset_id, task, description)
+            SELECT input.benchmark_name, COALESCE(input.dataset_id, new_datasets.id),
+                   input.task, input.description
+            FROM input LEFT JOIN new_datasets ON new_datasets.name = input.dataset_name
+            ORDER BY 1, 2
+            ON CONFLICT (name, dataset_id) DO NOTHING
+        )
+        SELECT name, id FROM new_datasets
+    """, [rows[key] for key in sorted(rows)], template="(%s, %s, %s, %s, %s::uuid, %s)",
+        page_size=len(rows), fetch=True)
+
+    conn.commit()
+    dataset_ids.update(returned)
+    known_benchmarks.update(
+        (benchmark_name, dataset_ids[dataset_name]) for benchmark_name, dataset_name in rows
+    )
+
+
+def stream_evaluation_tables(rank=0, world_size=1, paths=None):
+    """Stream evaluation-tables directly to database.
+
+    With world_size > 1 this handles only the rank-th share of the rows, so
+    several workers (each with its own connection) can split the stream.
+    paths are the local parquet files, resolved with evaluation_files() if
+    not given.
+    """
+    if paths is None:
+        paths = evaluation_files()
+    prefix = f"[worker {rank}] " if world_size > 1 else ""
 
     conn = psycopg2.connect(DATABASE_URL)
+    conn.autocommit = False  # Each batch is one explicit transaction
     cur = conn.cursor()
+    # Inserts are idempotent (ON CONFLICT), so commits needn't wait for the WAL flush
+    cur.execute("SET synchronous_commit = off")
 
-    ds = load_dataset('pwc-archive/evaluation-tables', streaming=True)
+    # Existing datasets and benchmarks need no further writes
+    cur.execute("SELECT name, id FROM datasets")
+    dataset_ids = dict(cur.fetchall())
+    cur.execute("SELECT name, dataset_id FROM benchmarks")
+    known_benchmarks = set(cur.fetchall())
+    conn.commit()
 
     inserted = 0
     errors = 0
+    processed = 0
 
-    for i, row in enumerate(ds['train']):
-        try:
-            task_name = row.get('task', '')
-            description = row.get('description', '')
-            categories = row.get('categories', [])
-            datasets_info = row.get('datasets', [])
-
-            # Process each dataset in the evaluation table
-            for ds_info in datasets_info:
-                if isinstance(ds_info, dict):
-                    dataset_name = ds_info.get('dataset', '')
-
-                    if dataset_name and task_name:
-                        # Get or create dataset
-                        cur.execute("""
-                            INSERT INTO datasets (name, description)
-                            VALUES (%s, %s)
-                            ON CONFLICT (name) DO UPDATE SET updated_at = NOW()
-                            RETURNING id
-                        """, (dataset_name, description[:500] if description else None))
-
-                        result = cur.fetchone()
-                        if result:
-                            dataset_id = result[0]
-
-                            # Create benchmark
-                            benchmark_name = f"{task_name} on {dataset_name}"
-                            cur.execute("""
-                                INSERT INTO benchmarks (name, dataset_id, task, description)
-                                VALUES (%s, %s, %s, %s)
-                                ON CONFLICT (name, dataset_id) DO NOTHING
-                            """, (benchmark_name, dataset_id, task_name, description[:500] if description else None))
-
-                            inserted += 1
-
-            if (i + 1) % 100 == 0:
-                conn.commit()
-                print(f"  Processed {i + 1} rows, inserted {inserted} benchmarks")
+    # Write each batch of rows with a single multi-row statement
+    for batch in iter_evaluation_batches(paths, rank, world_size):
+        frame = evaluation_benchmarks(batch)
+        # A dataset takes the description of the first row that mentions it
+        first_mentions = frame.drop_duplicates("dataset_name")
+        datasets = dict(
+            zip(first_mentions["dataset_name"], first_mentions["description"], strict=True)
+        )
+        benchmarks = list(frame.itertuples(index=False, name=None))
 
+        try:
+            flush_evaluation_batch(
+                conn, cur, datasets, benchmarks, dataset_ids, known_benchmarks
+            )
+            inserted += len(benchmarks)
         except Exception as e:
+            conn.rollback()
             errors += 1
             if errors <= 5:
-                print(f"  Error on row {i}: {e}")
+                print(f"  {prefix}Error on rows {processed}-{processed + len(batch) - 1}: {e}")
+
+        processed += len(batch)
+        print(f"  {prefix}Processed {processed} rows, inserted {inserted} benchmarks")
 
-    conn.commit()
     cur.close()
     conn.close()
 
-    print(f"✓ Evaluation tables complete: {inserted} benchmarks inserted, {errors} errors")
+    print(f"{prefix}✓ Evaluation tables complete: {inserted} benchmarks inserted, {errors} errors")
     return inserted
 
 
+def stream_evaluation_tables_parallel(workers):
+    """Stream evaluation-tables with several worker processes, one shard each."""
+    print("\n=== Streaming evaluation-tables ===")
+
+    # Resolved once here rather than in every worker
+    paths = evaluation_files()
+
+    # No more workers than batches, so none of them sits idle
+    total_rows = sum(pq.read_metadata(path).num_rows for path in paths)
+    workers = min(workers, -(-total_rows // BATCH_SIZE))
+
+    if workers <= 1:
+        return stream_evaluation_tables(paths=paths)
+
+    with Pool(processes=workers) as pool:
+        counts = pool.starmap(
+            stream_evaluation_tables, [(rank, workers, paths) for rank in range(workers)]
+        )
+    return sum(counts)
+
+
 def stream_files():
     """Stream files dataset to see what it contains."""
     print("\n=== Streaming files ===")
@@ -84,23 +255,35 @@ def stream_files():
     count = 0
     for split_name in ds.keys():
         print(f"  Split: {split_name}")
-        for i, row in enumerate(ds[split_name]):
+        shown = 0
+        for i, row in enumerate(ds[split_name].take(5)):
             print(f"    Row {i}: {list(row.keys())}")
-            count += 1
-            if i >= 4:
-                print(f"    ... (showing first 5)")
-                break
+            shown += 1
+        if shown == 5:
+            print(f"    ... (showing first 5)")
+        count += shown
 
     print(f"✓ Files dataset has multiple splits, {count}+ rows visible")
     return count
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Stream remaining PWC datasets directly to the database"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes streaming evaluation tables in parallel (default: 1)",
+    )
+    args = parser.parse_args()
+
     print("Streaming remaining PWC datasets to database")
     print("=" * 60)
 
     # Stream evaluation tables
-    eval_count = stream_evaluation_tables()
+    eval_count = stream_evaluation_tables_parallel(args.workers)
 
     # Stream files (just inspect for now)
     files_count = stream_files()
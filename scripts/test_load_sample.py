@@ -2,10 +2,13 @@
 """Test loading a small sample of data."""
 
 import os
+import io
+import csv
 import psycopg2
 import pandas as pd
-import json
+import pyarrow.parquet as pq
 from pathlib import Path
+from load_pwc_data_to_postgres import encode_authors
 
 DATABASE_URL = os.getenv('DATABASE_URL')
 if not DATABASE_URL:
@@ -17,68 +20,81 @@ def test_load_sample():
     papers_file = DATA_DIR / "papers-with-abstracts" / "train.parquet"
 
     print("Reading sample data...")
-    df = pd.read_parquet(papers_file)
-    sample = df.head(10)  # Just 10 rows for testing
+    # Only decode the first 10 rows (and the columns used) rather than the whole file
+    columns = ["title", "abstract", "arxiv_id", "url_abs", "url_pdf", "date", "authors"]
+    parquet = pq.ParquetFile(papers_file)
+    batch = next(parquet.iter_batches(batch_size=10, columns=columns))
+    sample = batch.to_pandas()
+    # Same encoding the full loader uses
+    sample["authors"] = encode_authors(sample["authors"])
 
     print(f"Sample has {len(sample)} rows")
-    print(f"Columns: {list(sample.columns)}")
+    print(f"Columns: {parquet.schema_arrow.names}")
 
     conn = psycopg2.connect(DATABASE_URL)
     cur = conn.cursor()
 
-    inserted = 0
-    for idx, row in sample.iterrows():
+    staged = []
+    for row in sample.itertuples(index=True):
+        idx = row.Index
+
         # Skip papers without arxiv_id
-        if pd.isna(row.get('arxiv_id')):
+        if pd.isna(row.arxiv_id):
             print(f"  Skipping row {idx}: no arxiv_id")
             continue
 
-        # Parse authors (it's a numpy array in parquet)
-        authors = row.get('authors')
-        if authors is not None and hasattr(authors, 'tolist'):
-            # Convert numpy array to list
-            authors = authors.tolist()
-        elif isinstance(authors, str):
-            try:
-                authors = json.loads(authors)
-            except:
-                authors = None
-        else:
-            authors = None
-
         # Parse date
-        published_date = row.get('date')
+        published_date = row.date
         if pd.notna(published_date):
             if isinstance(published_date, pd.Timestamp):
                 published_date = published_date.date()
 
-        try:
-            cur.execute("""
-                INSERT INTO papers (title, abstract, arxiv_id, arxiv_url, pdf_url, published_date, authors)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (arxiv_id) DO NOTHING
-                RETURNING id;
-            """, (
-                row.get('title'),
-                row.get('abstract'),
-                row.get('arxiv_id'),
-                row.get('url_abs'),
-                row.get('url_pdf'),
-                published_date,
-                json.dumps(authors) if authors else None
-            ))
-
-            result = cur.fetchone()
-            if result:
-                paper_id = result[0]
-                print(f"  ✓ Inserted paper {idx}: {row.get('title')[:50]}... (ID: {paper_id})")
+        staged.append((idx, (
+            row.title,
+            row.abstract,
+            row.arxiv_id,
+            row.url_abs,
+            row.url_pdf,
+            published_date,
+            row.authors
+        )))
+
+    # COPY the sample into a staging table, then insert it in one statement
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for _, values in staged:
+        writer.writerow(['\\N' if pd.isna(v) else v for v in values])
+    buffer.seek(0)
+
+    inserted = 0
+    try:
+        cur.execute("""
+            CREATE TEMP TABLE papers_stage (LIKE papers INCLUDING DEFAULTS) ON COMMIT DROP;
+        """)
+        cur.copy_expert("""
+            COPY papers_stage (title, abstract, arxiv_id, arxiv_url, pdf_url, published_date, authors)
+            FROM STDIN WITH (FORMAT CSV, NULL '\\N')
+        """, buffer)
+        cur.execute("""
+            INSERT INTO papers (title, abstract, arxiv_id, arxiv_url, pdf_url, published_date, authors)
+            SELECT title, abstract, arxiv_id, arxiv_url, pdf_url, published_date, authors
+            FROM papers_stage
+            ON CONFLICT (arxiv_id) DO NOTHING
+            RETURNING arxiv_id, id;
+        """)
+        paper_ids = dict(cur.fetchall())
+
+        for idx, values in staged:
+            paper_id = paper_ids.pop(values[2], None)
+            if paper_id:
+                print(f"  ✓ Inserted paper {idx}: {values[0][:50]}... (ID: {paper_id})")
                 inserted += 1
             else:
                 print(f"  - Skipped paper {idx} (duplicate)")
 
-        except Exception as e:
-            print(f"  ✗ Error inserting paper {idx}: {e}")
-            continue
+    except Exception as e:
+        print(f"  ✗ Error inserting sample: {e}")
+        conn.rollback()
 
     conn.commit()
 
@@ -14,29 +14,29 @@ def test_connection():
     """Test database connection and list existing tables."""
     try:
         # Connect to the database
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = psycopg2.connect(DATABASE_URL, connect_timeout=10, keepalives=1, keepalives_idle=30)
         cur = conn.cursor()
 
         print("✓ Successfully connected to Neon Postgres database!")
 
-        # Get database version
-        cur.execute("SELECT version();")
-        version = cur.fetchone()[0]
-        print(f"\nPostgreSQL version:\n{version}\n")
-
-        # List existing tables
+        # Get database version and existing tables in a single round-trip
         cur.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            ORDER BY table_name;
+            SELECT
+                version(),
+                ARRAY(
+                    SELECT table_name::text
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public'
+                    ORDER BY table_name
+                );
         """)
+        version, tables = cur.fetchone()
+        print(f"\nPostgreSQL version:\n{version}\n")
 
-        tables = cur.fetchall()
         if tables:
             print("Existing tables:")
             for table in tables:
-                print(f"  - {table[0]}")
+                print(f"  - {table}")
         else:
             print("No tables found in public schema.")
 